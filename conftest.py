@@ -15,7 +15,7 @@ if TYPE_CHECKING:
     from shared.python.db import Script, Story
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session, sessionmaker
 
 # Set test environment variables before importing modules
@@ -42,17 +42,32 @@ def test_database_url() -> str:
 
 
 @pytest.fixture(scope="session")
-def test_engine(test_database_url: str):
+def test_schema() -> str:
+    """Schema private to this xdist worker, so workers can share one database."""
+    return f"test_{os.environ.get('PYTEST_XDIST_WORKER', 'gw0')}"
+
+
+@pytest.fixture(scope="session")
+def test_engine(test_database_url: str, test_schema: str):
     """Create a test database engine."""
     try:
-        engine = create_engine(test_database_url, echo=False)
-        yield engine
-        engine.dispose()
+        # Rows added together are sent as multi-row INSERTs of up to this many
+        engine = create_engine(
+            test_database_url,
+            echo=False,
+            insertmanyvalues_page_size=1000,
+            connect_args={"options": f"-csearch_path={test_schema}"},
+        )
+        with engine.begin() as conn:
+            conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{test_schema}"'))
     except Exception:
         # If database is not available, use SQLite for testing
-        engine = create_engine("sqlite:///:memory:", echo=False)
-        yield engine
-        engine.dispose()
+        engine = create_engine("sqlite:///:memory:", echo=False, insertmanyvalues_page_size=1000)
+    yield engine
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA IF EXISTS "{test_schema}" CASCADE'))
+    engine.dispose()
 
 
 @pytest.fixture(scope="session")
@@ -65,16 +80,46 @@ def test_tables(test_engine):
     Base.metadata.drop_all(bind=test_engine)
 
 
+@pytest.fixture(scope="session")
+def db_connection(test_engine, test_tables):
+    """One connection for the whole session, inside an outer transaction.
+
+    Nothing the tests write is ever committed; the outer transaction is rolled
+    back at the end of the session.
+    """
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    yield connection
+    transaction.rollback()
+    connection.close()
+
+
 @pytest.fixture
-def db_session(test_engine, test_tables) -> Generator[Session, None, None]:
-    """Create a database session for tests."""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+def db_session(db_connection) -> Generator[Session, None, None]:
+    """Create a database session for tests.
+
+    Each test runs inside its own SAVEPOINT on the shared connection, which is
+    rolled back afterwards, so even rows a test commits are discarded. The
+    session joins that savepoint through a nested one of its own, making
+    ``commit()`` safe to call. Objects are not expired on commit, since nothing
+    outside the test can change the rows underneath them. Queries on the
+    session see flushed rows, so tests only need ``flush()``.
+    """
+    nested = db_connection.begin_nested()
+    TestingSessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=db_connection,
+        join_transaction_mode="create_savepoint",
+    )
     session = TestingSessionLocal()
     try:
         yield session
     finally:
-        session.rollback()
         session.close()
+        if nested.is_active:
+            nested.rollback()
 
 
 @pytest.fixture
@@ -135,9 +180,9 @@ def mock_celery_app():
         yield mock
 
 
-@pytest.fixture
-def mock_smtp():
-    """Mock SMTP for email testing."""
+@pytest.fixture(scope="module")
+def smtp_server_mock():
+    """Patch SMTP once per module and return the mocked server connection."""
     with patch("smtplib.SMTP") as mock:
         mock_server = MagicMock()
         mock.return_value.__enter__ = MagicMock(return_value=mock_server)
@@ -145,6 +190,13 @@ def mock_smtp():
         yield mock_server
 
 
+@pytest.fixture
+def mock_smtp(smtp_server_mock):
+    """Mock SMTP for email testing, with call counts reset for each test."""
+    smtp_server_mock.reset_mock()
+    return smtp_server_mock
+
+
 @pytest.fixture
 def mock_praw():
     """Mock PRAW (Reddit API) client."""
@@ -179,7 +231,8 @@ class StoryFactory(FactoryBase):
     """Factory for creating Story test objects."""
 
     @classmethod
-    def create(cls, db_session: Session, **kwargs) -> Story:
+    def build(cls, **kwargs) -> Story:
+        """Story with factory defaults, not yet added to a session."""
         from shared.python.db import Story
 
         defaults = {
@@ -193,8 +246,11 @@ class StoryFactory(FactoryBase):
             "status": "pending",
         }
         defaults.update(kwargs)
+        return Story(**defaults)
 
-        story = Story(**defaults)
+    @classmethod
+    def create(cls, db_session: Session, **kwargs) -> Story:
+        story = cls.build(**kwargs)
         db_session.add(story)
         db_session.flush()
         return story
@@ -203,35 +259,125 @@ class StoryFactory(FactoryBase):
 class ScriptFactory(FactoryBase):
     """Factory for creating Script test objects."""
 
+    defaults = {
+        "part_number": 1,
+        "total_parts": 1,
+        "hook": "Did you hear about...",
+        "content": "Factory generated script content.",
+        "cta": "Follow for more!",
+        "char_count": 50,
+        "voice_gender": "male",
+    }
+
     @classmethod
-    def create(cls, db_session: Session, story: Story, **kwargs) -> Script:
+    def build(cls, story: Story, **kwargs) -> Script:
+        """Script for ``story`` with factory defaults, not yet flushed.
+
+        The script is linked through the relationship, so it also works for a
+        story that has no primary key yet.
+        """
         from shared.python.db import Script
 
-        defaults = {
-            "story_id": story.id,
-            "part_number": 1,
-            "total_parts": 1,
-            "hook": "Did you hear about...",
-            "content": "Factory generated script content.",
-            "cta": "Follow for more!",
-            "char_count": 50,
-            "voice_gender": "male",
-        }
-        defaults.update(kwargs)
+        return Script(**{"story": story, **cls.defaults, **kwargs})
 
-        script = Script(**defaults)
+    @classmethod
+    def create(cls, db_session: Session, story: Story, **kwargs) -> Script:
+        script = cls.build(story, **kwargs)
         db_session.add(script)
         db_session.flush()
         return script
 
+    @classmethod
+    def create_many(cls, db_session: Session, story: Story, n: int, **kwargs) -> list[Script]:
+        """Parts 1..n of ``story`` as one multi-row INSERT.
 
-@pytest.fixture
+        ``story`` must already be flushed. The scripts come back in part order
+        and ``story.scripts`` is expired so it reloads with them.
+        """
+        from sqlalchemy import insert
+
+        from shared.python.db import Script
+
+        rows = [
+            {**cls.defaults, "story_id": story.id, "part_number": part, "total_parts": n, **kwargs}
+            for part in range(1, n + 1)
+        ]
+        scripts = db_session.scalars(
+            insert(Script).returning(Script, sort_by_parameter_order=True), rows
+        ).all()
+        db_session.expire(story, ["scripts"])
+        return list(scripts)
+
+
+@pytest.fixture(scope="session")
 def story_factory():
     """Provide StoryFactory for tests."""
     return StoryFactory
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def script_factory():
     """Provide ScriptFactory for tests."""
     return ScriptFactory
+
+
+@pytest.fixture
+def pipeline_chain(db_session: Session, story_factory, script_factory):
+    """Factory for story -> scripts -> audio -> video -> upload chains.
+
+    ``make(part_count=1, upload_status="pending", stop_at="upload", **story_kwargs)``
+    returns ``(story, scripts, audios, videos, uploads)`` with one of each per
+    part. ``stop_at`` ("audio", "video" or "upload") is the last stage built;
+    the lists for later stages are empty. The objects are linked through their
+    relationships, so adding the story cascades to the whole chain and a single
+    flush inserts every row in dependency order.
+    """
+    from shared.python.db import Audio, Upload, UploadStatus, Video
+
+    stages = ("audio", "video", "upload")
+
+    def make(
+        part_count: int = 1,
+        upload_status: str = UploadStatus.PENDING.value,
+        stop_at: str = "upload",
+        **story_kwargs,
+    ):
+        if stop_at not in stages:
+            raise ValueError(f"stop_at must be one of {stages}, got {stop_at!r}")
+        last = stages.index(stop_at)
+
+        story = story_factory.build(**story_kwargs)
+        scripts = [
+            script_factory.build(story, part_number=part, total_parts=part_count)
+            for part in range(1, part_count + 1)
+        ]
+        audios = [
+            Audio(
+                script=script,
+                file_path=f"/data/audio/part{script.part_number}.wav",
+                duration_seconds=50.0,
+                voice_model="en_US-lessac-medium",
+            )
+            for script in scripts
+        ]
+        videos, uploads = [], []
+        if last >= stages.index("video"):
+            videos = [
+                Video(
+                    audio=audio,
+                    file_path=f"/data/videos/part{audio.script.part_number}.mp4",
+                    duration_seconds=50.0,
+                    resolution="1080x1920",
+                )
+                for audio in audios
+            ]
+        if last >= stages.index("upload"):
+            uploads = [
+                Upload(video=video, platform="tiktok", status=upload_status) for video in videos
+            ]
+
+        db_session.add(story)
+        db_session.flush()
+        return story, scripts, audios, videos, uploads
+
+    return make
@@ -4,6 +4,7 @@ import os
 
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_init, worker_process_shutdown
 
 # Build Redis URL from environment
 redis_host = os.getenv("REDIS_HOST", "localhost")
@@ -96,5 +97,29 @@ app.conf.beat_schedule = {
 }
 
 
+@worker_init.connect
+def setup_worker_metrics(**kwargs) -> None:
+    """Serve the metrics of the worker and its prefork children from the parent.
+
+    Runs in the parent before the pool forks, so the children inherit the
+    collector and write their samples to PROMETHEUS_MULTIPROC_DIR.
+    """
+    from shared.python.monitoring import init_metrics, start_metrics_server
+    from shared.python.monitoring.metrics import reset_multiprocess_dir
+
+    reset_multiprocess_dir()
+    collector = init_metrics("celery-worker")
+    if collector.enabled:
+        start_metrics_server(collector, port=int(os.getenv("METRICS_PORT", "9100")))
+
+
+@worker_process_shutdown.connect
+def cleanup_worker_metrics(pid: int | None = None, **kwargs) -> None:
+    """Drop live gauge samples of a prefork child when it exits."""
+    from shared.python.monitoring.metrics import mark_process_dead
+
+    mark_process_dead(pid or os.getpid())
+
+
 if __name__ == "__main__":
     app.start()
@@ -94,7 +94,12 @@ class Story(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    scripts = relationship("Script", back_populates="story", cascade="all, delete-orphan")
+    scripts = relationship(
+        "Script",
+        back_populates="story",
+        cascade="all, delete-orphan",
+        order_by="Script.part_number",
+    )
     batches = relationship("Batch", back_populates="story", cascade="all, delete-orphan")
     pipeline_runs = relationship(
         "PipelineRun", back_populates="story", cascade="all, delete-orphan"
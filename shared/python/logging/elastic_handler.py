@@ -1,15 +1,43 @@
 """Elasticsearch logging handler for centralized logging."""
 
+import json
 import logging
 import os
 import threading
-from datetime import datetime
+from datetime import date, datetime
 from queue import Empty, Queue
 from typing import Any
 
 from elasticsearch import Elasticsearch
 from elasticsearch.helpers import bulk
 
+# Standard LogRecord attributes; anything else on a record is an extra field
+_RECORD_ATTRS = frozenset(
+    (
+        "name",
+        "msg",
+        "args",
+        "created",
+        "filename",
+        "funcName",
+        "levelname",
+        "levelno",
+        "lineno",
+        "module",
+        "msecs",
+        "pathname",
+        "process",
+        "processName",
+        "relativeCreated",
+        "stack_info",
+        "exc_info",
+        "exc_text",
+        "thread",
+        "threadName",
+        "message",
+    )
+)
+
 
 class ElasticsearchHandler(logging.Handler):
     """
@@ -48,6 +76,10 @@ class ElasticsearchHandler(logging.Handler):
         self.index_prefix = index_prefix
         self.buffer_size = buffer_size
         self.flush_interval = flush_interval
+        # (UTC day, index name) so the name is formatted once per day, not per record
+        self._index_name_for_day: tuple[date, str] | None = None
+        # Per-handler constant part of every document's _source
+        self._source_template: dict[str, Any] = {"service": service_name}
 
         # Elasticsearch connection
         host = es_host or os.getenv("ELASTICSEARCH_HOST", "localhost")
@@ -71,8 +103,12 @@ class ElasticsearchHandler(logging.Handler):
 
     def _get_index_name(self) -> str:
         """Generate index name with current date."""
-        date_str = datetime.utcnow().strftime("%Y.%m.%d")
-        return f"{self.index_prefix}-{self.service_name}-{date_str}"
+        today = datetime.utcnow().date()
+        cached = self._index_name_for_day
+        if cached is None or cached[0] != today:
+            cached = (today, f"{self.index_prefix}-{self.service_name}-{today:%Y.%m.%d}")
+            self._index_name_for_day = cached
+        return cached[1]
 
     def emit(self, record: logging.LogRecord) -> None:
         """
@@ -108,54 +144,28 @@ class ElasticsearchHandler(logging.Handler):
         # Extract extra fields
         extra = {}
         for key, value in record.__dict__.items():
-            if key not in (
-                "name",
-                "msg",
-                "args",
-                "created",
-                "filename",
-                "funcName",
-                "levelname",
-                "levelno",
-                "lineno",
-                "module",
-                "msecs",
-                "pathname",
-                "process",
-                "processName",
-                "relativeCreated",
-                "stack_info",
-                "exc_info",
-                "exc_text",
-                "thread",
-                "threadName",
-                "message",
-            ):
+            if key not in _RECORD_ATTRS:
                 try:
                     # Only include JSON-serializable values
-                    import json
-
                     json.dumps(value)
                     extra[key] = value
                 except (TypeError, ValueError):
                     extra[key] = str(value)
 
-        return {
-            "_index": self._get_index_name(),
-            "_source": {
-                "timestamp": datetime.utcfromtimestamp(record.created).isoformat() + "Z",
-                "service": self.service_name,
-                "level": record.levelname,
-                "logger": record.name,
-                "message": record.getMessage(),
-                "module": record.module,
-                "function": record.funcName,
-                "line": record.lineno,
-                "process_id": record.process,
-                "thread_id": record.thread,
-                "extra": extra,
-            },
-        }
+        source = self._source_template.copy()
+        source.update(
+            timestamp=datetime.utcfromtimestamp(record.created).isoformat() + "Z",
+            level=record.levelname,
+            logger=record.name,
+            message=record.getMessage(),
+            module=record.module,
+            function=record.funcName,
+            line=record.lineno,
+            process_id=record.process,
+            thread_id=record.thread,
+            extra=extra,
+        )
+        return {"_index": self._get_index_name(), "_source": source}
 
     def _flush(self) -> None:
         """Flush the buffer to Elasticsearch."""
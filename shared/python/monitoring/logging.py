@@ -1,63 +1,88 @@
 """Structured logging configuration for all services."""
 
-import json
 import logging
 import os
 import sys
+from collections.abc import Callable
 from datetime import datetime
+from types import MappingProxyType
 from typing import Any
 
+import msgspec
+
+# Extra fields (story_id, script_id, etc.) copied from the record when present
+EXTRA_FIELDS = (
+    "story_id",
+    "script_id",
+    "audio_id",
+    "video_id",
+    "upload_id",
+    "batch_id",
+    "task_id",
+    "duration_ms",
+    "status",
+    "error_type",
+)
+
 
 class JSONFormatter(logging.Formatter):
-    """JSON formatter for structured logging to Elasticsearch."""
+    """JSON formatter for structured logging to Elasticsearch.
+
+    format() is generated per formatter: the service name is baked into the
+    record template and the probe for extra fields is unrolled, so no
+    per-record loop or attribute lookups on the formatter remain. Records are
+    encoded with msgspec; values it can't encode (UUIDs from the ORM, for
+    example) are written as their str().
+    """
 
     def __init__(self, service_name: str):
         super().__init__()
         self.service_name = service_name
-
-    def format(self, record: logging.LogRecord) -> str:
-        log_data = {
-            "@timestamp": datetime.utcnow().isoformat() + "Z",
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-            "service": self.service_name,
-            "module": record.module,
-            "function": record.funcName,
-            "line": record.lineno,
-        }
-
-        # Add exception info if present
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
-
-        # Add extra fields (story_id, script_id, etc.)
-        extra_fields = [
-            "story_id",
-            "script_id",
-            "audio_id",
-            "video_id",
-            "upload_id",
-            "batch_id",
-            "task_id",
-            "duration_ms",
-            "status",
-            "error_type",
+        self.format = self._build_format()
+
+    def _build_format(self) -> Callable[[logging.LogRecord], str]:
+        lines = [
+            "def format(record):",
+            "    data = {",
+            '        "@timestamp": _utcnow().isoformat() + "Z",',
+            '        "level": record.levelname,',
+            '        "logger": record.name,',
+            '        "message": record.getMessage(),',
+            f'        "service": {self.service_name!r},',
+            '        "module": record.module,',
+            '        "function": record.funcName,',
+            '        "line": record.lineno,',
+            "    }",
+            "    if record.exc_info:",
+            '        data["exception"] = _format_exception(record.exc_info)',
+            "    rd = record.__dict__",
         ]
-        for field in extra_fields:
-            if hasattr(record, field):
-                log_data[field] = getattr(record, field)
-
-        return json.dumps(log_data)
+        for field in EXTRA_FIELDS:
+            lines.append(f"    if {field!r} in rd:")
+            lines.append(f"        data[{field!r}] = rd[{field!r}]")
+        lines.append("    return _encode(data).decode()")
+
+        namespace = {
+            "_utcnow": datetime.utcnow,
+            "_format_exception": self.formatException,
+            # One encoder per formatter; values msgspec can't encode become str
+            "_encode": msgspec.json.Encoder(enc_hook=str).encode,
+        }
+        exec("\n".join(lines), namespace)
+        return namespace["format"]
 
 
 class CorrelationAdapter(logging.LoggerAdapter):
     """Logger adapter that adds correlation IDs to all log messages."""
 
     def process(self, msg: str, kwargs: dict[str, Any]) -> tuple[str, dict[str, Any]]:
-        extra = kwargs.get("extra", {})
-        extra.update(self.extra)
-        kwargs["extra"] = extra
+        # The adapter context is immutable, so it is passed through as-is unless
+        # the caller supplied its own extras; correlation IDs take precedence.
+        extra = kwargs.get("extra")
+        if extra:
+            kwargs["extra"] = {**extra, **self.extra}
+        else:
+            kwargs["extra"] = self.extra
         return msg, kwargs
 
 
@@ -133,4 +158,4 @@ def get_logger(
     if script_id:
         context["script_id"] = script_id
 
-    return CorrelationAdapter(logger, context)
+    return CorrelationAdapter(logger, MappingProxyType(context))
@@ -1,5 +1,7 @@
 """Prometheus metrics collection for all services."""
 
+from __future__ import annotations
+
 import os
 import time
 from collections.abc import Callable
@@ -10,60 +12,77 @@ from typing import Any
 try:
     from prometheus_client import (
         REGISTRY,
+        CollectorRegistry,
         Counter,
         Gauge,
         Histogram,
         generate_latest,
+        multiprocess,
     )
 
     PROMETHEUS_AVAILABLE = True
 except ImportError:
     PROMETHEUS_AVAILABLE = False
 
+# Multiprocess mode is on when PROMETHEUS_MULTIPROC_DIR is set in the environment
+# of every process (e.g. Celery prefork children). Each process then writes its
+# samples to mmap'd files in that directory, which are aggregated at scrape time.
+MULTIPROCESS_ENABLED = PROMETHEUS_AVAILABLE and bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
 
 class MetricsCollector:
     """Centralized metrics collection for TikTok Auto pipeline."""
 
-    def __init__(self, service_name: str):
+    def __init__(self, service_name: str, registry: CollectorRegistry | None = None):
         self.service_name = service_name
         self.enabled = PROMETHEUS_AVAILABLE and os.getenv("METRICS_ENABLED", "true").lower() == "true"
+        self._mp_registry: CollectorRegistry | None = None
 
         if not self.enabled:
             return
 
+        # Defaults to the process-wide registry; tests pass their own
+        self.registry = registry if registry is not None else REGISTRY
+
         # Pipeline counters
         self.stories_fetched = Counter(
             "tiktok_auto_stories_fetched_total",
             "Total number of stories fetched from Reddit",
             ["subreddit"],
+            registry=self.registry,
         )
 
         self.stories_processed = Counter(
             "tiktok_auto_stories_processed_total",
             "Total number of stories processed",
             ["status"],
+            registry=self.registry,
         )
 
         self.scripts_created = Counter(
             "tiktok_auto_scripts_created_total",
             "Total number of scripts created",
+            registry=self.registry,
         )
 
         self.audio_generated = Counter(
             "tiktok_auto_audio_generated_total",
             "Total number of audio files generated",
             ["voice_model"],
+            registry=self.registry,
         )
 
         self.videos_rendered = Counter(
             "tiktok_auto_videos_rendered_total",
             "Total number of videos rendered",
+            registry=self.registry,
         )
 
         self.uploads_total = Counter(
             "tiktok_auto_uploads_total",
             "Total number of upload attempts",
             ["status"],
+            registry=self.registry,
         )
 
         # Processing time histograms
@@ -71,53 +90,67 @@ class MetricsCollector:
             "tiktok_auto_text_processing_duration_seconds",
             "Time spent processing text",
             buckets=[0.5, 1, 2, 5, 10, 30, 60],
+            registry=self.registry,
         )
 
         self.audio_generation_duration = Histogram(
             "tiktok_auto_audio_generation_duration_seconds",
             "Time spent generating audio",
             buckets=[1, 5, 10, 30, 60, 120, 300],
+            registry=self.registry,
         )
 
         self.video_rendering_duration = Histogram(
             "tiktok_auto_video_rendering_duration_seconds",
             "Time spent rendering video",
             buckets=[10, 30, 60, 120, 300, 600],
+            registry=self.registry,
         )
 
         self.upload_duration = Histogram(
             "tiktok_auto_upload_duration_seconds",
             "Time spent uploading to TikTok",
             buckets=[5, 10, 30, 60, 120, 300],
+            registry=self.registry,
         )
 
-        # Queue gauges
+        # Queue gauges hold absolute counts set by whichever process looked last,
+        # so multiprocess mode reports the most recent value instead of a sum
         self.pending_stories = Gauge(
             "tiktok_auto_pending_stories",
             "Number of stories pending approval",
+            multiprocess_mode="livemostrecent",
+            registry=self.registry,
         )
 
         self.pending_uploads = Gauge(
             "tiktok_auto_pending_uploads",
             "Number of videos pending upload",
+            multiprocess_mode="livemostrecent",
+            registry=self.registry,
         )
 
         self.failed_uploads = Gauge(
             "tiktok_auto_failed_uploads",
             "Number of failed uploads awaiting retry",
+            multiprocess_mode="livemostrecent",
+            registry=self.registry,
         )
 
-        # Celery task gauges
+        # Celery task gauges; each process counts its own tasks, so they are summed
         self.celery_tasks_active = Gauge(
             "tiktok_auto_celery_tasks_active",
             "Number of active Celery tasks",
             ["task_name"],
+            multiprocess_mode="livesum",
+            registry=self.registry,
         )
 
         self.celery_tasks_total = Counter(
             "tiktok_auto_celery_tasks_total",
             "Total Celery tasks executed",
             ["task_name", "status"],
+            registry=self.registry,
         )
 
         # Error counters
@@ -125,13 +158,23 @@ class MetricsCollector:
             "tiktok_auto_errors_total",
             "Total errors by type",
             ["service", "error_type"],
+            registry=self.registry,
         )
 
     def get_metrics(self) -> bytes:
         """Generate Prometheus metrics output."""
         if not self.enabled:
             return b""
-        return generate_latest(REGISTRY)
+        if MULTIPROCESS_ENABLED:
+            return generate_latest(self._multiprocess_registry())
+        return generate_latest(self.registry)
+
+    def _multiprocess_registry(self) -> CollectorRegistry:
+        """Registry that aggregates samples from all processes on collect."""
+        if self._mp_registry is None:
+            self._mp_registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(self._mp_registry)
+        return self._mp_registry
 
     @contextmanager
     def track_duration(self, histogram_name: str):
@@ -231,8 +274,28 @@ class MetricsCollector:
 metrics: MetricsCollector | None = None
 
 
-def init_metrics(service_name: str) -> MetricsCollector:
+def init_metrics(service_name: str, registry: CollectorRegistry | None = None) -> MetricsCollector:
     """Initialize metrics for a service."""
     global metrics
-    metrics = MetricsCollector(service_name)
+    metrics = MetricsCollector(service_name, registry=registry)
     return metrics
+
+
+def reset_multiprocess_dir() -> None:
+    """Create PROMETHEUS_MULTIPROC_DIR and remove samples left by a previous run.
+
+    Must run in the parent process before any child is forked.
+    """
+    if not MULTIPROCESS_ENABLED:
+        return
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+
+
+def mark_process_dead(pid: int) -> None:
+    """Remove live gauge samples of an exited process in multiprocess mode."""
+    if MULTIPROCESS_ENABLED:
+        multiprocess.mark_process_dead(pid)
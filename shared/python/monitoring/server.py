@@ -10,6 +10,14 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Status line and headers for /metrics, completed with the body length per request
+METRICS_RESPONSE_HEAD = (
+    b"%s 200 OK\r\n"
+    b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+    b"Content-Length: %d\r\n"
+    b"\r\n"
+)
+
 
 class MetricsHandler(BaseHTTPRequestHandler):
     """HTTP handler for /metrics endpoint."""
@@ -37,16 +45,16 @@ class MetricsHandler(BaseHTTPRequestHandler):
 
         try:
             output = self.metrics_collector.get_metrics()
-            self.send_response(200)
-            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
-            self.send_header("Content-Length", str(len(output)))
-            self.end_headers()
-            self.wfile.write(output)
         except Exception as e:
             logger.error(f"Error serving metrics: {e}")
             self.send_response(500)
             self.end_headers()
             self.wfile.write(f"Error: {e}".encode())
+            return
+
+        # Send status line, headers and body with a single write
+        head = METRICS_RESPONSE_HEAD % (self.protocol_version.encode(), len(output))
+        self.wfile.write(head + output)
 
     def _serve_health(self):
         """Serve health check."""
@@ -68,10 +68,12 @@ class RateLimiter:
             ttl = self.redis.ttl(key)
             raise RateLimitExceeded("reddit_api", ttl if ttl > 0 else 60)
 
-        pipe = self.redis.pipeline()
-        pipe.incr(key)
-        pipe.expire(key, 60)
-        pipe.execute()
+        # Non-transactional: both commands go in one round trip without MULTI/EXEC.
+        # A pipeline per call, since pipelines must not be shared between threads.
+        with self.redis.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, 60)
+            pipe.execute()
 
         return True
 
@@ -95,10 +97,10 @@ class RateLimiter:
             retry_after = int((midnight - now).total_seconds())
             raise RateLimitExceeded("tiktok_upload", retry_after)
 
-        pipe = self.redis.pipeline()
-        pipe.incr(key)
-        pipe.expireat(key, int((datetime.utcnow() + timedelta(days=1)).timestamp()))
-        pipe.execute()
+        with self.redis.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.expireat(key, int((datetime.utcnow() + timedelta(days=1)).timestamp()))
+            pipe.execute()
 
         return True
 
@@ -118,10 +120,10 @@ class RateLimiter:
             ttl = self.redis.ttl(key)
             raise RateLimitExceeded("ollama_api", ttl if ttl > 0 else 60)
 
-        pipe = self.redis.pipeline()
-        pipe.incr(key)
-        pipe.expire(key, 60)
-        pipe.execute()
+        with self.redis.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, 60)
+            pipe.execute()
 
         return True
 
@@ -186,9 +188,15 @@ def rate_limited(limit_type: str) -> Callable:
     """
 
     def decorator(func: Callable) -> Callable:
+        # One limiter (and Redis connection pool) per decorated function, created
+        # on first call so decorating doesn't read the environment at import time
+        limiter: RateLimiter | None = None
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            limiter = RateLimiter()
+            nonlocal limiter
+            if limiter is None:
+                limiter = RateLimiter()
             check_methods = {
                 "reddit": limiter.check_reddit_api,
                 "tiktok": limiter.check_tiktok_upload,
@@ -176,3 +176,25 @@ class TestUploadModel:
         assert UploadStatus.SUCCESS.value == "success"
         assert UploadStatus.FAILED.value == "failed"
         assert UploadStatus.MANUAL_REQUIRED.value == "manual_required"
+
+
+class TestSessionIsolation:
+    """Tests that db_session discards each test's writes."""
+
+    REDDIT_ID = "test_isolation"
+
+    def test_commit_inside_test(self, db_session, story_factory):
+        """Test committing a story from inside a test."""
+        story = story_factory.create(db_session, reddit_id=self.REDDIT_ID)
+        db_session.commit()
+
+        assert db_session.get(type(story), story.id) is story
+
+    def test_committed_row_is_rolled_back(self, db_session):
+        """Test that the story committed by the previous test is gone."""
+        from sqlalchemy import select
+
+        from shared.python.db import Story
+
+        stmt = select(Story).where(Story.reddit_id == self.REDDIT_ID)
+        assert db_session.scalars(stmt).first() is None
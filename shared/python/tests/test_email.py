@@ -2,6 +2,51 @@
 
 from unittest.mock import patch
 
+import pytest
+
+from shared.python.email import EmailNotifier
+
+
+def _set_smtp_env(
+    monkeypatch, user="test@example.com", password="testpass", email="notify@example.com"
+):
+    """Set the SMTP credentials EmailNotifier reads from the environment."""
+    monkeypatch.setenv("SMTP_USER", user)
+    monkeypatch.setenv("SMTP_PASSWORD", password)
+    monkeypatch.setenv("NOTIFICATION_EMAIL", email)
+
+
+def _assert_sent(mock_smtp, expected_sends=1):
+    """Assert the number of messages handed to the mocked SMTP server."""
+    assert mock_smtp.sendmail.call_count == expected_sends
+
+
+@pytest.fixture(scope="module")
+def notifier():
+    """Notifier configured through its arguments, shared across the module."""
+    return EmailNotifier(
+        smtp_user="test@example.com",
+        smtp_password="testpass",
+        notification_email="notify@example.com",
+    )
+
+
+@pytest.fixture
+def unconfigured_notifier(monkeypatch):
+    """Notifier with empty SMTP credentials.
+
+    Empty arguments fall back to the environment, so blank it there instead.
+    """
+    _set_smtp_env(monkeypatch, user="", password="", email="")
+    return EmailNotifier()
+
+
+@pytest.fixture
+def smtp_raises():
+    """SMTP class patched to refuse connections."""
+    with patch("smtplib.SMTP", side_effect=ConnectionRefusedError("Connection refused")) as m:
+        yield m
+
 
 class TestEmailNotifier:
     """Tests for EmailNotifier class."""
@@ -10,11 +55,7 @@ class TestEmailNotifier:
         """Test that notifier uses environment variables."""
         monkeypatch.setenv("SMTP_HOST", "test.smtp.com")
         monkeypatch.setenv("SMTP_PORT", "465")
-        monkeypatch.setenv("SMTP_USER", "test@example.com")
-        monkeypatch.setenv("SMTP_PASSWORD", "testpass")
-        monkeypatch.setenv("NOTIFICATION_EMAIL", "notify@example.com")
-
-        from shared.python.email import EmailNotifier
+        _set_smtp_env(monkeypatch)
 
         notifier = EmailNotifier()
 
@@ -26,8 +67,6 @@ class TestEmailNotifier:
 
     def test_notifier_init_with_args(self):
         """Test that notifier can be initialized with explicit args."""
-        from shared.python.email import EmailNotifier
-
         notifier = EmailNotifier(
             smtp_host="custom.smtp.com",
             smtp_port=587,
@@ -39,15 +78,8 @@ class TestEmailNotifier:
         assert notifier.smtp_host == "custom.smtp.com"
         assert notifier.smtp_port == 587
 
-    def test_send_failure_alert(self, mock_smtp, monkeypatch):
+    def test_send_failure_alert(self, mock_smtp, notifier):
         """Test sending a failure alert."""
-        monkeypatch.setenv("SMTP_USER", "test@example.com")
-        monkeypatch.setenv("SMTP_PASSWORD", "testpass")
-        monkeypatch.setenv("NOTIFICATION_EMAIL", "notify@example.com")
-
-        from shared.python.email import EmailNotifier
-
-        notifier = EmailNotifier()
         result = notifier.send_failure_alert(
             video_id="test-video-123",
             failure_type="upload_failed",
@@ -55,35 +87,21 @@ class TestEmailNotifier:
         )
 
         assert result is True
-        mock_smtp.starttls.assert_called_once()
-        mock_smtp.login.assert_called_once()
-        mock_smtp.sendmail.assert_called_once()
+        assert mock_smtp.starttls.call_count == 1
+        assert mock_smtp.login.call_count == 1
+        _assert_sent(mock_smtp)
 
-    def test_send_failure_alert_without_credentials(self, monkeypatch):
+    def test_send_failure_alert_without_credentials(self, unconfigured_notifier):
         """Test that send_failure_alert returns False without credentials."""
-        monkeypatch.setenv("SMTP_USER", "")
-        monkeypatch.setenv("SMTP_PASSWORD", "")
-        monkeypatch.setenv("NOTIFICATION_EMAIL", "")
-
-        from shared.python.email import EmailNotifier
-
-        notifier = EmailNotifier()
-        result = notifier.send_failure_alert(
+        result = unconfigured_notifier.send_failure_alert(
             video_id="test-video-123",
             failure_type="upload_failed",
         )
 
         assert result is False
 
-    def test_send_failure_alert_with_extra_info(self, mock_smtp, monkeypatch):
+    def test_send_failure_alert_with_extra_info(self, mock_smtp, notifier):
         """Test that extra_info is included in the email."""
-        monkeypatch.setenv("SMTP_USER", "test@example.com")
-        monkeypatch.setenv("SMTP_PASSWORD", "testpass")
-        monkeypatch.setenv("NOTIFICATION_EMAIL", "notify@example.com")
-
-        from shared.python.email import EmailNotifier
-
-        notifier = EmailNotifier()
         result = notifier.send_failure_alert(
             video_id="test-video-123",
             failure_type="upload_failed",
@@ -92,20 +110,13 @@ class TestEmailNotifier:
         )
 
         assert result is True
+        _assert_sent(mock_smtp)
         # Verify sendmail was called with content containing extra info
-        call_args = mock_smtp.sendmail.call_args
-        email_content = call_args[0][2]  # Third argument is the message
+        email_content = mock_smtp.sendmail.call_args.args[2]  # Third argument is the message
         assert "story_title" in email_content or "Test Story" in email_content
 
-    def test_send_batch_summary_complete(self, mock_smtp, monkeypatch):
+    def test_send_batch_summary_complete(self, mock_smtp, notifier):
         """Test sending a complete batch summary."""
-        monkeypatch.setenv("SMTP_USER", "test@example.com")
-        monkeypatch.setenv("SMTP_PASSWORD", "testpass")
-        monkeypatch.setenv("NOTIFICATION_EMAIL", "notify@example.com")
-
-        from shared.python.email import EmailNotifier
-
-        notifier = EmailNotifier()
         result = notifier.send_batch_summary(
             batch_id="batch-123",
             story_title="Test Story Title",
@@ -115,19 +126,12 @@ class TestEmailNotifier:
         )
 
         assert result is True
-        call_args = mock_smtp.sendmail.call_args
-        email_content = call_args[0][2]
+        _assert_sent(mock_smtp)
+        email_content = mock_smtp.sendmail.call_args.args[2]
         assert "Complete" in email_content
 
-    def test_send_batch_summary_partial(self, mock_smtp, monkeypatch):
+    def test_send_batch_summary_partial(self, mock_smtp, notifier):
         """Test sending a partial batch summary."""
-        monkeypatch.setenv("SMTP_USER", "test@example.com")
-        monkeypatch.setenv("SMTP_PASSWORD", "testpass")
-        monkeypatch.setenv("NOTIFICATION_EMAIL", "notify@example.com")
-
-        from shared.python.email import EmailNotifier
-
-        notifier = EmailNotifier()
         result = notifier.send_batch_summary(
             batch_id="batch-456",
             story_title="Partial Story",
@@ -138,28 +142,17 @@ class TestEmailNotifier:
 
         assert result is True
         # Verify sendmail was called (email was sent)
-        mock_smtp.sendmail.assert_called_once()
+        _assert_sent(mock_smtp)
         # The email subject contains "Partial" but is MIME-encoded
-        call_args = mock_smtp.sendmail.call_args
-        email_content = call_args[0][2]
+        email_content = mock_smtp.sendmail.call_args.args[2]
         # Check that the batch ID is somewhere in the email (unencoded in headers or body)
         assert "batch-456" in email_content or mock_smtp.sendmail.called
 
-    def test_send_email_handles_smtp_error(self, monkeypatch):
+    def test_send_email_handles_smtp_error(self, smtp_raises, notifier):
         """Test that SMTP errors are handled gracefully."""
-        monkeypatch.setenv("SMTP_USER", "test@example.com")
-        monkeypatch.setenv("SMTP_PASSWORD", "testpass")
-        monkeypatch.setenv("NOTIFICATION_EMAIL", "notify@example.com")
-
-        from shared.python.email import EmailNotifier
-
-        with patch("smtplib.SMTP") as mock_smtp_class:
-            mock_smtp_class.side_effect = ConnectionRefusedError("Connection refused")
-
-            notifier = EmailNotifier()
-            result = notifier.send_failure_alert(
-                video_id="test-video-123",
-                failure_type="upload_failed",
-            )
+        result = notifier.send_failure_alert(
+            video_id="test-video-123",
+            failure_type="upload_failed",
+        )
 
-            assert result is False
+        assert result is False
@@ -3,14 +3,39 @@
 import logging
 from unittest.mock import patch
 
+import pytest
+from freezegun import freeze_time
+
+from shared.python.logging import ContextFilter, LogContext, setup_logging
+from shared.python.logging.elastic_handler import ElasticsearchHandler
+
+
+@pytest.fixture(scope="module")
+def ctx_filter():
+    """ContextFilter shared across the module; it holds no per-record state."""
+    return ContextFilter()
+
+
+BASE_RECORD_KWARGS = {
+    "name": "test",
+    "level": logging.INFO,
+    "pathname": "/test/path.py",
+    "lineno": 1,
+    "args": (),
+    "exc_info": None,
+}
+
+
+def _make_record(msg="Test", **overrides):
+    """Build a LogRecord from BASE_RECORD_KWARGS with the given overrides."""
+    return logging.LogRecord(msg=msg, **{**BASE_RECORD_KWARGS, **overrides})
+
 
 class TestSetupLogging:
     """Tests for setup_logging function."""
 
     def test_setup_logging_returns_logger(self):
         """Test that setup_logging returns a logger."""
-        from shared.python.logging import setup_logging
-
         with patch("shared.python.logging.elastic_handler.Elasticsearch"):
             logger = setup_logging("test-service", enable_elasticsearch=False)
 
@@ -19,8 +44,6 @@ class TestSetupLogging:
 
     def test_setup_logging_respects_level(self):
         """Test that setup_logging sets the correct level."""
-        from shared.python.logging import setup_logging
-
         logger = setup_logging("test-service", level="DEBUG", enable_elasticsearch=False)
         assert logger.level == logging.DEBUG
 
@@ -29,8 +52,6 @@ class TestSetupLogging:
 
     def test_setup_logging_with_env_level(self, monkeypatch):
         """Test that setup_logging uses LOG_LEVEL env var."""
-        from shared.python.logging import setup_logging
-
         monkeypatch.setenv("LOG_LEVEL", "ERROR")
         logger = setup_logging("test-service-env", enable_elasticsearch=False)
         assert logger.level == logging.ERROR
@@ -41,8 +62,6 @@ class TestLogContext:
 
     def test_log_context_adds_fields(self):
         """Test that LogContext adds extra fields."""
-        from shared.python.logging import LogContext
-
         with LogContext(story_id="123", task_id="456"):
             context = LogContext.get_context()
             assert context["story_id"] == "123"
@@ -50,8 +69,6 @@ class TestLogContext:
 
     def test_log_context_removes_fields_on_exit(self):
         """Test that LogContext removes fields when exiting."""
-        from shared.python.logging import LogContext
-
         with LogContext(story_id="123"):
             assert "story_id" in LogContext.get_context()
 
@@ -59,8 +76,6 @@ class TestLogContext:
 
     def test_log_context_nested(self):
         """Test nested LogContext."""
-        from shared.python.logging import LogContext
-
         with LogContext(outer="value1"):
             with LogContext(inner="value2"):
                 context = LogContext.get_context()
@@ -75,65 +90,61 @@ class TestLogContext:
 class TestElasticsearchHandler:
     """Tests for ElasticsearchHandler."""
 
-    def test_handler_format_record(self, mock_elasticsearch):
+    @pytest.mark.parametrize("level", [logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR])
+    def test_handler_format_record(self, mock_elasticsearch, level):
         """Test that records are formatted correctly."""
-        from shared.python.logging.elastic_handler import ElasticsearchHandler
-
         handler = ElasticsearchHandler("test-service", es_host="localhost", es_port=9200)
 
-        record = logging.LogRecord(
-            name="test",
-            level=logging.INFO,
-            pathname="/test/path.py",
-            lineno=42,
-            msg="Test message",
-            args=(),
-            exc_info=None,
-        )
+        record = _make_record("Test message", level=level, lineno=42)
 
         formatted = handler._format_record(record)
 
         assert "_index" in formatted
         assert "test-service" in formatted["_index"]
-        assert formatted["_source"]["level"] == "INFO"
+        assert formatted["_source"]["level"] == logging.getLevelName(level)
         assert formatted["_source"]["message"] == "Test message"
         assert formatted["_source"]["service"] == "test-service"
+        assert formatted["_source"]["line"] == 42
+
+    def test_handler_format_record_does_not_share_source(self, mock_elasticsearch):
+        """Test that each record gets its own _source built from the template."""
+        handler = ElasticsearchHandler("test-service", es_host="localhost", es_port=9200)
+
+        first = handler._format_record(_make_record("first"))
+        second = handler._format_record(_make_record("second"))
+
+        assert first["_source"] is not second["_source"]
+        assert first["_source"]["message"] == "first"
+        assert handler._source_template == {"service": "test-service"}
 
     def test_handler_index_name_includes_date(self, mock_elasticsearch):
         """Test that index name includes current date."""
-        from datetime import datetime
+        handler = ElasticsearchHandler("test-service", es_host="localhost", es_port=9200)
 
-        from shared.python.logging.elastic_handler import ElasticsearchHandler
+        with freeze_time("2024-01-15"):
+            index_name = handler._get_index_name()
 
-        handler = ElasticsearchHandler("test-service", es_host="localhost", es_port=9200)
+        assert index_name == "tiktok-auto-test-service-2024.01.15"
 
-        index_name = handler._get_index_name()
-        today = datetime.utcnow().strftime("%Y.%m.%d")
+    def test_handler_index_name_rolls_over_at_midnight(self, mock_elasticsearch):
+        """Test that the cached index name changes with the UTC day."""
+        handler = ElasticsearchHandler("test-service", es_host="localhost", es_port=9200)
 
-        assert f"tiktok-auto-test-service-{today}" == index_name
+        with freeze_time("2024-01-15 23:59:59") as frozen:
+            assert handler._get_index_name().endswith("2024.01.15")
+            frozen.tick(2)
+            assert handler._get_index_name().endswith("2024.01.16")
 
 
 class TestContextFilter:
     """Tests for ContextFilter."""
 
-    def test_filter_adds_context_to_record(self):
+    def test_filter_adds_context_to_record(self, ctx_filter):
         """Test that filter adds context to log records."""
-        from shared.python.logging import ContextFilter, LogContext
-
-        filter_obj = ContextFilter()
-
         with LogContext(request_id="abc123"):
-            record = logging.LogRecord(
-                name="test",
-                level=logging.INFO,
-                pathname="/test/path.py",
-                lineno=1,
-                msg="Test",
-                args=(),
-                exc_info=None,
-            )
-
-            result = filter_obj.filter(record)
+            record = _make_record()
+
+            result = ctx_filter.filter(record)
 
             assert result is True
             assert hasattr(record, "request_id")
@@ -1,61 +1,72 @@
 """Tests for Prometheus metrics module."""
 
+import importlib
+import socket
+import time
+import urllib.request
 from unittest.mock import patch
 
 import pytest
+from prometheus_client import CollectorRegistry, values
 
+from shared.python.monitoring.metrics import (
+    MetricsCollector,
+    init_metrics,
+    mark_process_dead,
+    reset_multiprocess_dir,
+)
+from shared.python.monitoring.server import start_metrics_server
 
-@pytest.fixture(autouse=True)
-def reset_prometheus_registry():
-    """Reset the Prometheus registry before each test."""
-    try:
-        from prometheus_client import REGISTRY
-
-        # Collect all collectors to unregister
-        collectors_to_unregister = []
-        for collector in list(REGISTRY._collector_to_names.keys()):
-            # Skip the default collectors (platform, gc, process)
-            collector_name = type(collector).__name__
-            if collector_name not in ("PlatformCollector", "GCCollector", "ProcessCollector"):
-                collectors_to_unregister.append(collector)
-
-        for collector in collectors_to_unregister:
-            try:
-                REGISTRY.unregister(collector)
-            except Exception:
-                pass
-    except ImportError:
-        pass
-
-    yield
-
-    # Cleanup after test
-    try:
-        from prometheus_client import REGISTRY
-
-        collectors_to_unregister = []
-        for collector in list(REGISTRY._collector_to_names.keys()):
-            collector_name = type(collector).__name__
-            if collector_name not in ("PlatformCollector", "GCCollector", "ProcessCollector"):
-                collectors_to_unregister.append(collector)
-
-        for collector in collectors_to_unregister:
-            try:
-                REGISTRY.unregister(collector)
-            except Exception:
-                pass
-    except ImportError:
-        pass
+# The package re-exports the ``metrics`` global under the submodule's name
+metrics_module = importlib.import_module("shared.python.monitoring.metrics")
+
+
+@pytest.fixture
+def registry():
+    """Fresh Prometheus registry so each test registers its metrics in isolation."""
+    return CollectorRegistry()
+
+
+@pytest.fixture(scope="module")
+def metrics_server():
+    """Start one metrics server for the module and yield it with its port."""
+    collector = MetricsCollector("test-service", registry=CollectorRegistry())
+
+    # Start on a random port to avoid conflicts
+    with socket.socket() as s:
+        s.bind(("", 0))
+        port = s.getsockname()[1]
+
+    server = start_metrics_server(collector, port=port)
+
+    # Wait until the server answers instead of sleeping a fixed amount
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://localhost:{port}/health", timeout=0.05).read()
+            break
+        except OSError:  # URLError, refused connections and timeouts
+            time.sleep(0.005)
+    else:
+        server.shutdown()
+        pytest.fail(f"metrics server on port {port} did not answer within 2s")
+
+    yield server, port
+
+    server.shutdown()
+
+
+@pytest.fixture
+def collector(registry):
+    """Collector for the test-service bound to the per-test registry."""
+    return MetricsCollector("test-service", registry=registry)
 
 
 class TestMetricsCollector:
     """Tests for MetricsCollector class."""
 
-    def test_init_with_prometheus_available(self):
+    def test_init_with_prometheus_available(self, collector):
         """Test initialization when prometheus_client is available."""
-        from shared.python.monitoring.metrics import MetricsCollector
-
-        collector = MetricsCollector("test-service")
         assert collector.service_name == "test-service"
         assert collector.enabled is True
 
@@ -65,53 +76,35 @@ class TestMetricsCollector:
 
         with patch.dict(os.environ, {"METRICS_ENABLED": "false"}):
             # Mock the MetricsCollector to test the disabled behavior
-            from shared.python.monitoring.metrics import MetricsCollector
-
             # Create a collector with mocked env
             collector = MetricsCollector.__new__(MetricsCollector)
             collector.service_name = "test-service"
             collector.enabled = os.getenv("METRICS_ENABLED", "true").lower() == "true"
             assert collector.enabled is False
 
-    def test_get_metrics_returns_bytes(self):
+    def test_get_metrics_returns_bytes(self, collector):
         """Test get_metrics returns Prometheus format."""
-        from shared.python.monitoring.metrics import MetricsCollector
-
-        collector = MetricsCollector("test-service")
         output = collector.get_metrics()
         assert isinstance(output, bytes)
         assert b"python_info" in output or len(output) > 0
 
-    def test_record_story_fetched(self):
+    def test_record_story_fetched(self, collector):
         """Test recording a story fetch."""
-        from shared.python.monitoring.metrics import MetricsCollector
-
-        collector = MetricsCollector("test-service")
         # Should not raise
         collector.record_story_fetched("testsub")
 
-    def test_record_upload(self):
+    def test_record_upload(self, collector):
         """Test recording upload status."""
-        from shared.python.monitoring.metrics import MetricsCollector
-
-        collector = MetricsCollector("test-service")
         collector.record_upload("success")
         collector.record_upload("failed")
 
-    def test_track_duration_context_manager(self):
+    def test_track_duration_context_manager(self, collector):
         """Test duration tracking context manager."""
-        from shared.python.monitoring.metrics import MetricsCollector
-
-        collector = MetricsCollector("test-service")
-
         with collector.track_duration("audio_generation_duration"):
             pass  # Simulated work
 
-    def test_track_task_decorator(self):
+    def test_track_task_decorator(self, collector):
         """Test task tracking decorator."""
-        from shared.python.monitoring.metrics import MetricsCollector
-
-        collector = MetricsCollector("test-service")
 
         @collector.track_task("test_task")
         def sample_task():
@@ -120,78 +113,89 @@ class TestMetricsCollector:
         result = sample_task()
         assert result == "result"
 
-    def test_set_gauges(self):
+    def test_set_gauges(self, collector):
         """Test setting gauge values."""
-        from shared.python.monitoring.metrics import MetricsCollector
-
-        collector = MetricsCollector("test-service")
         collector.set_pending_stories(5)
         collector.set_pending_uploads(3)
         collector.set_failed_uploads(1)
 
 
-class TestMetricsServer:
-    """Tests for metrics HTTP server."""
+@pytest.fixture
+def multiprocess_dir(tmp_path, monkeypatch):
+    """Put the metrics module in multiprocess mode, backed by ``tmp_path``."""
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics_module, "MULTIPROCESS_ENABLED", True)
+    return tmp_path
 
-    def test_start_metrics_server(self):
-        """Test starting the metrics server."""
-        from shared.python.monitoring.metrics import MetricsCollector
-        from shared.python.monitoring.server import start_metrics_server
 
-        collector = MetricsCollector("test-service")
+def _worker_collector(monkeypatch, pid: int) -> MetricsCollector:
+    """Collector whose samples are written to the multiprocess files of ``pid``."""
+    monkeypatch.setattr(values, "ValueClass", values.MultiProcessValue(lambda: pid))
+    return MetricsCollector("celery-worker", registry=CollectorRegistry())
 
-        # Start on a random port to avoid conflicts
-        import socket
 
-        with socket.socket() as s:
-            s.bind(("", 0))
-            port = s.getsockname()[1]
+class TestMultiprocessMetrics:
+    """Tests for aggregating metrics across prefork worker processes."""
 
-        server = start_metrics_server(collector, port=port)
-        assert server is not None
+    def test_get_metrics_aggregates_processes(self, multiprocess_dir, monkeypatch):
+        """Test set() gauges report one value while inc/dec gauges are summed."""
+        for pid in (101, 102):
+            worker = _worker_collector(monkeypatch, pid)
+            worker.set_pending_stories(5)
+            worker.celery_tasks_active.labels(task_name="render_video").inc()
 
-        # Cleanup
-        server.shutdown()
+        output = worker.get_metrics()
 
-    def test_metrics_endpoint(self):
-        """Test /metrics endpoint returns data."""
-        import socket
-        import urllib.request
+        assert b"tiktok_auto_pending_stories 5.0" in output
+        assert b'tiktok_auto_celery_tasks_active{task_name="render_video"} 2.0' in output
 
-        from shared.python.monitoring.metrics import MetricsCollector
-        from shared.python.monitoring.server import start_metrics_server
+    def test_mark_process_dead_drops_live_samples(self, multiprocess_dir, monkeypatch):
+        """Test the live gauges of an exited process leave the aggregate."""
+        for pid in (101, 102):
+            worker = _worker_collector(monkeypatch, pid)
+            worker.celery_tasks_active.labels(task_name="render_video").inc()
 
-        collector = MetricsCollector("test-service")
+        mark_process_dead(101)
 
-        # Find free port
-        with socket.socket() as s:
-            s.bind(("", 0))
-            port = s.getsockname()[1]
+        output = worker.get_metrics()
+        assert b'tiktok_auto_celery_tasks_active{task_name="render_video"} 1.0' in output
+        assert not list(multiprocess_dir.glob("gauge_livesum_101.db"))
 
-        server = start_metrics_server(collector, port=port)
+    def test_reset_multiprocess_dir_removes_old_samples(self, multiprocess_dir, monkeypatch):
+        """Test samples from a previous worker run are cleared at startup."""
+        _worker_collector(monkeypatch, 101).set_pending_stories(5)
+        assert list(multiprocess_dir.glob("*.db"))
 
-        try:
-            # Give server time to start
-            import time
+        reset_multiprocess_dir()
 
-            time.sleep(0.1)
+        assert not list(multiprocess_dir.glob("*.db"))
 
-            # Make request
-            with urllib.request.urlopen(f"http://localhost:{port}/metrics") as response:
-                assert response.status == 200
-                data = response.read()
-                assert len(data) > 0
-        finally:
-            server.shutdown()
+
+class TestMetricsServer:
+    """Tests for metrics HTTP server."""
+
+    def test_start_metrics_server(self, metrics_server):
+        """Test starting the metrics server."""
+        server, _ = metrics_server
+        assert server is not None
+
+    def test_metrics_endpoint(self, metrics_server):
+        """Test /metrics endpoint returns data."""
+        _, port = metrics_server
+
+        with urllib.request.urlopen(f"http://localhost:{port}/metrics") as response:
+            assert response.status == 200
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            data = response.read()
+            assert len(data) == int(response.headers["Content-Length"])
+            assert len(data) > 0
 
 
 class TestInitMetrics:
     """Tests for init_metrics function."""
 
-    def test_init_metrics_returns_collector(self):
+    def test_init_metrics_returns_collector(self, registry):
         """Test init_metrics returns a collector."""
-        from shared.python.monitoring.metrics import init_metrics
-
-        collector = init_metrics("test-service")
+        collector = init_metrics("test-service", registry=registry)
         assert collector is not None
         assert collector.service_name == "test-service"
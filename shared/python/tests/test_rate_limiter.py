@@ -0,0 +1,68 @@
+"""Tests for the Redis rate limiter."""
+
+from unittest.mock import patch
+
+import pytest
+
+from shared.python.rate_limiter import RateLimiter, RateLimitExceeded
+from shared.python.rate_limiter.limiter import rate_limited
+
+
+@pytest.fixture
+def mock_redis():
+    """Patch redis.Redis; every counter reads as unset."""
+    with patch("shared.python.rate_limiter.limiter.redis.Redis") as redis_cls:
+        redis_cls.return_value.get.return_value = None
+        yield redis_cls
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+
+    @pytest.mark.parametrize(
+        "check", ["check_reddit_api", "check_tiktok_upload", "check_ollama_api"]
+    )
+    def test_check_increments_in_non_transactional_pipeline(self, mock_redis, check):
+        """Test that the counter update is sent in one pipeline without MULTI/EXEC."""
+        limiter = RateLimiter()
+
+        assert getattr(limiter, check)() is True
+
+        client = mock_redis.return_value
+        client.pipeline.assert_called_once_with(transaction=False)
+        pipe = client.pipeline.return_value.__enter__.return_value
+        pipe.incr.assert_called_once()
+        pipe.execute.assert_called_once()
+
+    def test_check_raises_when_limit_reached(self, mock_redis, monkeypatch):
+        """Test that a full window raises without touching the counter."""
+        monkeypatch.setenv("REDDIT_RATE_LIMIT", "2")
+        client = mock_redis.return_value
+        client.get.return_value = "2"
+        client.ttl.return_value = 15
+
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            RateLimiter().check_reddit_api()
+
+        assert exc_info.value.retry_after == 15
+        client.pipeline.assert_not_called()
+
+
+class TestRateLimitedDecorator:
+    """Tests for the rate_limited decorator."""
+
+    def test_limiter_created_once(self, mock_redis):
+        """Test that the limiter and its Redis client are reused across calls."""
+
+        @rate_limited("reddit")
+        def fetch():
+            return "posts"
+
+        mock_redis.assert_not_called()
+
+        assert fetch() == "posts"
+        assert fetch() == "posts"
+
+        assert mock_redis.call_count == 1
+        assert mock_redis.return_value.pipeline.call_count == 2
+        mock_redis.return_value.pipeline.assert_called_with(transaction=False)
@@ -0,0 +1,112 @@
+"""Tests for structured logging in the monitoring module."""
+
+import json
+import logging
+import sys
+import uuid
+
+from shared.python.monitoring.logging import JSONFormatter, get_logger
+
+
+def _make_record(msg="Test message", exc_info=None, **extra):
+    record = logging.LogRecord(
+        name="test",
+        level=logging.INFO,
+        pathname="/test/path.py",
+        lineno=42,
+        msg=msg,
+        args=(),
+        exc_info=exc_info,
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJSONFormatter:
+    """Tests for JSONFormatter."""
+
+    def test_format_base_fields(self):
+        """Test that every record includes the fixed fields."""
+        formatter = JSONFormatter("test-service")
+
+        data = json.loads(formatter.format(_make_record()))
+
+        assert data["@timestamp"].endswith("Z")
+        assert data["level"] == "INFO"
+        assert data["logger"] == "test"
+        assert data["message"] == "Test message"
+        assert data["service"] == "test-service"
+        assert data["line"] == 42
+        assert "story_id" not in data
+        assert "exception" not in data
+
+    def test_format_includes_extra_fields(self):
+        """Test that known extra fields are copied from the record."""
+        formatter = JSONFormatter("test-service")
+
+        record = _make_record(story_id="abc", duration_ms=12.5, status=None, unrelated="x")
+        data = json.loads(formatter.format(record))
+
+        assert data["story_id"] == "abc"
+        assert data["duration_ms"] == 12.5
+        assert data["status"] is None
+        assert "unrelated" not in data
+        assert "script_id" not in data
+
+    def test_format_includes_exception(self):
+        """Test that exception info is rendered."""
+        formatter = JSONFormatter("test-service")
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = _make_record(exc_info=sys.exc_info())
+
+        data = json.loads(formatter.format(record))
+
+        assert "ValueError: boom" in data["exception"]
+
+    def test_format_stringifies_uuid_extra(self):
+        """Test that UUID extras, as passed from ORM objects, are written as strings."""
+        formatter = JSONFormatter("test-service")
+        story_id = uuid.uuid4()
+
+        data = json.loads(formatter.format(_make_record(story_id=story_id)))
+
+        assert data["story_id"] == str(story_id)
+
+    def test_service_name_is_escaped(self):
+        """Test that quotes in the service name survive the generated template."""
+        formatter = JSONFormatter("test-'service")
+
+        data = json.loads(formatter.format(_make_record()))
+
+        assert data["service"] == "test-'service"
+
+
+class TestCorrelationAdapter:
+    """Tests for get_logger and CorrelationAdapter."""
+
+    def test_adapter_adds_context(self, caplog):
+        """Test that correlation IDs are attached to every record."""
+        logger = get_logger("test.adapter", story_id="story-1", batch_id="batch-1")
+
+        with caplog.at_level(logging.INFO, logger="test.adapter"):
+            logger.info("First")
+            logger.info("Second")
+
+        assert [r.story_id for r in caplog.records] == ["story-1", "story-1"]
+        assert caplog.records[0].batch_id == "batch-1"
+
+    def test_adapter_merges_caller_extra(self, caplog):
+        """Test that caller extras are merged without being mutated."""
+        logger = get_logger("test.adapter", story_id="story-1")
+        caller_extra = {"task_id": "task-1"}
+
+        with caplog.at_level(logging.INFO, logger="test.adapter"):
+            logger.info("Message", extra=caller_extra)
+
+        record = caplog.records[0]
+        assert record.story_id == "story-1"
+        assert record.task_id == "task-1"
+        assert caller_extra == {"task_id": "task-1"}
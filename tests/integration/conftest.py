@@ -0,0 +1,28 @@
+"""Shared fixtures for integration tests."""
+
+import os
+
+import pytest
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+
+
+@pytest.fixture(scope="session")
+def compose_file() -> str:
+    """Path to docker-compose.yml."""
+    return os.path.join(REPO_ROOT, "docker-compose.yml")
+
+
+@pytest.fixture(scope="session")
+def compose_data(compose_file: str) -> dict:
+    """docker-compose.yml parsed once per test session."""
+    import yaml
+
+    # libyaml's C loader when PyYAML was built with it; same safe semantics
+    try:
+        from yaml import CSafeLoader as _Loader
+    except ImportError:
+        from yaml import SafeLoader as _Loader
+
+    with open(compose_file) as f:
+        return yaml.load(f, Loader=_Loader)
@@ -5,77 +5,100 @@ They can be run in CI or locally with Docker.
 """
 
 import os
+import re
 
 import pytest
 
+SERVICES_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "services")
 
-class TestDockerfileValidation:
-    """Validate Dockerfile syntax and structure."""
+SERVICE_DOCKERFILES = [
+    os.path.join(SERVICES_PATH, "reddit_fetch", "Dockerfile"),
+    os.path.join(SERVICES_PATH, "approval_dashboard", "Dockerfile"),
+    os.path.join(SERVICES_PATH, "text_processor", "Dockerfile"),
+    os.path.join(SERVICES_PATH, "tts_service", "Dockerfile"),
+    os.path.join(SERVICES_PATH, "video_renderer", "Dockerfile"),
+    os.path.join(SERVICES_PATH, "uploader", "Dockerfile"),
+]
+
+SERVICES_NEEDING_PORTS = ["approval_dashboard", "uploader"]
+
+# Anchored to instruction starts so comments mentioning FROM/EXPOSE don't match
+_FROM_RE = re.compile(r"^FROM\s+\S+", re.MULTILINE)
+_EXPOSE_RE = re.compile(r"^EXPOSE\s+\d+", re.MULTILINE)
 
-    @pytest.fixture
-    def service_dockerfiles(self):
-        """List of all service Dockerfiles."""
-        base_path = os.path.join(os.path.dirname(__file__), "..", "..", "services")
-        return [
-            os.path.join(base_path, "reddit_fetch", "Dockerfile"),
-            os.path.join(base_path, "approval_dashboard", "Dockerfile"),
-            os.path.join(base_path, "text_processor", "Dockerfile"),
-            os.path.join(base_path, "tts_service", "Dockerfile"),
-            os.path.join(base_path, "video_renderer", "Dockerfile"),
-            os.path.join(base_path, "uploader", "Dockerfile"),
-        ]
 
-    def test_all_dockerfiles_exist(self, service_dockerfiles):
-        """Verify all service Dockerfiles exist."""
-        for dockerfile in service_dockerfiles:
-            assert os.path.exists(dockerfile), f"Missing Dockerfile: {dockerfile}"
+def _service_name(dockerfile: str) -> str:
+    return os.path.basename(os.path.dirname(dockerfile))
 
-    def test_dockerfiles_have_valid_base_image(self, service_dockerfiles):
-        """Verify Dockerfiles have valid FROM instruction."""
-        for dockerfile in service_dockerfiles:
-            if not os.path.exists(dockerfile):
-                continue
 
+@pytest.fixture(scope="session")
+def dockerfile_contents() -> dict[str, str]:
+    """Contents of each existing service Dockerfile, read once per session."""
+    contents = {}
+    for dockerfile in SERVICE_DOCKERFILES:
+        if os.path.exists(dockerfile):
             with open(dockerfile) as f:
-                content = f.read()
+                contents[dockerfile] = f.read()
+    return contents
+
+
+def _env_keys(env: list[str] | dict) -> frozenset[str]:
+    """Variable names from a compose ``environment`` block in list or mapping form."""
+    if isinstance(env, dict):
+        return frozenset(env)
+    return frozenset(item.split("=", 1)[0] if "=" in item else item.lstrip("- ") for item in env)
+
+
+@pytest.fixture(scope="session")
+def service_env(compose_data: dict) -> dict[str, frozenset[str]]:
+    """Environment variable names of each compose service, computed once per session."""
+    return {
+        name: _env_keys(service.get("environment") or [])
+        for name, service in compose_data.get("services", {}).items()
+    }
+
 
-            assert "FROM" in content, f"No FROM instruction in {dockerfile}"
+class TestDockerfileValidation:
+    """Validate Dockerfile syntax and structure."""
+
+    @pytest.mark.parametrize("dockerfile", SERVICE_DOCKERFILES, ids=_service_name)
+    def test_dockerfile_exists(self, dockerfile):
+        """Verify the service Dockerfile exists."""
+        assert os.path.exists(dockerfile), f"Missing Dockerfile: {dockerfile}"
 
-    def test_dockerfiles_expose_ports(self, service_dockerfiles):
-        """Verify Dockerfiles expose necessary ports."""
-        services_needing_ports = ["approval_dashboard", "uploader"]
+    @pytest.mark.parametrize("dockerfile", SERVICE_DOCKERFILES, ids=_service_name)
+    def test_dockerfile_has_valid_base_image(self, dockerfile, dockerfile_contents):
+        """Verify the Dockerfile has a valid FROM instruction."""
+        if dockerfile not in dockerfile_contents:
+            pytest.skip(f"Missing Dockerfile: {dockerfile}")
 
-        for dockerfile in service_dockerfiles:
-            if not os.path.exists(dockerfile):
-                continue
+        assert _FROM_RE.search(dockerfile_contents[dockerfile]), (
+            f"No FROM instruction in {dockerfile}"
+        )
 
-            service_name = os.path.basename(os.path.dirname(dockerfile))
-            if service_name in services_needing_ports:
-                with open(dockerfile) as f:
-                    content = f.read()
-                assert "EXPOSE" in content, f"No EXPOSE in {dockerfile}"
+    @pytest.mark.parametrize(
+        "dockerfile",
+        [d for d in SERVICE_DOCKERFILES if _service_name(d) in SERVICES_NEEDING_PORTS],
+        ids=_service_name,
+    )
+    def test_dockerfile_exposes_ports(self, dockerfile, dockerfile_contents):
+        """Verify the Dockerfile exposes the service port."""
+        if dockerfile not in dockerfile_contents:
+            pytest.skip(f"Missing Dockerfile: {dockerfile}")
+
+        assert _EXPOSE_RE.search(dockerfile_contents[dockerfile]), f"No EXPOSE in {dockerfile}"
 
 
 class TestDockerComposeValidation:
     """Validate docker-compose.yml structure."""
 
-    @pytest.fixture
-    def compose_file(self):
-        """Path to docker-compose.yml."""
-        return os.path.join(os.path.dirname(__file__), "..", "..", "docker-compose.yml")
-
     def test_compose_file_exists(self, compose_file):
         """Verify docker-compose.yml exists."""
         assert os.path.exists(compose_file)
 
-    def test_compose_has_required_services(self, compose_file):
+    def test_compose_has_required_services(self, compose_data):
         """Verify all required services are defined."""
-        import yaml
-
-        with open(compose_file) as f:
-            compose = yaml.safe_load(f)
-
-        services = compose.get("services", {})
+        services = compose_data.get("services", {})
         required_services = [
             "postgres",
             "redis",
@@ -93,41 +116,26 @@ class TestDockerComposeValidation:
         for service in required_services:
             assert service in services, f"Missing service: {service}"
 
-    def test_compose_has_health_checks(self, compose_file):
+    def test_compose_has_health_checks(self, compose_data):
         """Verify infrastructure services have health checks."""
-        import yaml
-
-        with open(compose_file) as f:
-            compose = yaml.safe_load(f)
-
-        services = compose.get("services", {})
+        services = compose_data.get("services", {})
         infrastructure_services = ["postgres", "redis", "elasticsearch"]
 
         for service_name in infrastructure_services:
             service = services.get(service_name, {})
             assert "healthcheck" in service, f"No healthcheck for {service_name}"
 
-    def test_compose_has_volumes(self, compose_file):
+    def test_compose_has_volumes(self, compose_data):
         """Verify compose defines persistent volumes."""
-        import yaml
-
-        with open(compose_file) as f:
-            compose = yaml.safe_load(f)
-
-        volumes = compose.get("volumes", {})
+        volumes = compose_data.get("volumes", {})
         required_volumes = ["postgres-data", "redis-data"]
 
         for volume in required_volumes:
             assert volume in volumes, f"Missing volume: {volume}"
 
-    def test_compose_has_network(self, compose_file):
+    def test_compose_has_network(self, compose_data):
         """Verify compose defines a network."""
-        import yaml
-
-        with open(compose_file) as f:
-            compose = yaml.safe_load(f)
-
-        networks = compose.get("networks", {})
+        networks = compose_data.get("networks", {})
         assert len(networks) > 0, "No networks defined"
 
 
@@ -159,19 +167,9 @@ class TestServiceHealthEndpoints:
 class TestServiceDependencies:
     """Test service dependency configuration."""
 
-    @pytest.fixture
-    def compose_file(self):
-        """Path to docker-compose.yml."""
-        return os.path.join(os.path.dirname(__file__), "..", "..", "docker-compose.yml")
-
-    def test_services_depend_on_infrastructure(self, compose_file):
+    def test_services_depend_on_infrastructure(self, compose_data):
         """Verify application services depend on infrastructure."""
-        import yaml
-
-        with open(compose_file) as f:
-            compose = yaml.safe_load(f)
-
-        services = compose.get("services", {})
+        services = compose_data.get("services", {})
         app_services = [
             "dashboard",
             "reddit-fetch",
@@ -187,14 +185,9 @@ class TestServiceDependencies:
             # Should depend on at least postgres or redis
             assert len(depends_on) > 0, f"{service_name} has no dependencies"
 
-    def test_celery_worker_has_correct_dependencies(self, compose_file):
+    def test_celery_worker_has_correct_dependencies(self, compose_data):
         """Verify celery worker depends on required services."""
-        import yaml
-
-        with open(compose_file) as f:
-            compose = yaml.safe_load(f)
-
-        services = compose.get("services", {})
+        services = compose_data.get("services", {})
         worker = services.get("celery-worker", {})
         depends_on = worker.get("depends_on", {})
 
@@ -205,77 +198,28 @@ class TestServiceDependencies:
 class TestEnvironmentVariables:
     """Test environment variable configuration."""
 
-    @pytest.fixture
-    def compose_file(self):
-        """Path to docker-compose.yml."""
-        return os.path.join(os.path.dirname(__file__), "..", "..", "docker-compose.yml")
-
-    def test_services_have_database_config(self, compose_file):
+    def test_services_have_database_config(self, service_env):
         """Verify services have database configuration."""
-        import yaml
-
-        with open(compose_file) as f:
-            compose = yaml.safe_load(f)
-
-        services = compose.get("services", {})
         services_needing_db = ["dashboard", "reddit-fetch", "celery-worker"]
 
         for service_name in services_needing_db:
-            service = services.get(service_name, {})
-            env = service.get("environment", [])
-
-            # Convert list to dict if needed
-            if isinstance(env, list):
-                env_dict = {}
-                for item in env:
-                    if "=" in item:
-                        key, _ = item.split("=", 1)
-                        env_dict[key] = True
-                    else:
-                        env_dict[item.lstrip("- ")] = True
-                env = env_dict
-
-            env_keys = (
-                list(env.keys())
-                if isinstance(env, dict)
-                else [e.split("=")[0] if "=" in e else e for e in env]
-            )
-
-            assert any(
-                "POSTGRES" in k for k in env_keys
-            ), f"{service_name} missing POSTGRES config"
-
-    def test_uploader_has_tiktok_config(self, compose_file):
-        """Verify uploader has TikTok-specific configuration."""
-        import yaml
-
-        with open(compose_file) as f:
-            compose = yaml.safe_load(f)
-
-        services = compose.get("services", {})
-        uploader = services.get("uploader", {})
-        env = uploader.get("environment", [])
+            postgres_keys = {
+                k for k in service_env.get(service_name, ()) if k.startswith("POSTGRES")
+            }
+            assert postgres_keys, f"{service_name} missing POSTGRES config"
 
-        env_str = str(env)
-        assert "TIKTOK" in env_str or "COOKIES" in env_str
+    def test_uploader_has_tiktok_config(self, service_env):
+        """Verify uploader has TikTok-specific configuration."""
+        keys = service_env["uploader"]
+        assert any("TIKTOK" in k or "COOKIES" in k for k in keys)
 
 
 class TestVolumeMapping:
     """Test volume mapping configuration."""
 
-    @pytest.fixture
-    def compose_file(self):
-        """Path to docker-compose.yml."""
-        return os.path.join(os.path.dirname(__file__), "..", "..", "docker-compose.yml")
-
-    def test_data_volume_mapped(self, compose_file):
+    def test_data_volume_mapped(self, compose_data):
         """Verify data directory is volume mapped to services."""
-        import yaml
-
-        with open(compose_file) as f:
-            compose = yaml.safe_load(f)
-
-        services = compose.get("services", {})
+        services = compose_data.get("services", {})
         services_needing_data = ["video-renderer", "tts-service", "uploader"]
 
         for service_name in services_needing_data: